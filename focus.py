@@ -2,16 +2,18 @@ def clear_today_tasks():
     """Delete all tasks for today"""
     log_file = get_day_log_file()
     if log_file.exists():
-        # Create a backup first
-        backup_file = log_file.with_suffix('.backup')
-        import shutil
-        shutil.copy2(log_file, backup_file)
+        # Stop appending to the file we are about to replace
+        _close_day_writer()
         
-        # Delete the file
-        log_file.unlink()
+        # Move the log aside as a backup (a rename, so nothing is copied)
+        backup_file = log_file.with_suffix('.backup')
+        log_file.replace(backup_file)
         
         # Create a new empty file with just the header
         initialize_day_log()
+        
+        # Today's abandoned tasks are gone, so rebuild the index on next use
+        ABANDONED_INDEX.unlink(missing_ok=True)
     
     # Make sure statistics get updated
     update_statistics()#!/usr/bin/env python3
@@ -22,20 +24,33 @@ Logs task history to CSV files organized by month
 Supports interactive commands during execution
 """
 
-import time
 import os
 import sys
-import subprocess
 import datetime
 import json
-import signal
 import argparse
 import csv
-import threading
 import select
-import queue
+import termios
+import tty
+import contextlib
+import mmap
 from pathlib import Path
 
+# Use orjson for config and index IO when it is installed
+try:
+    import orjson
+    
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, indent=2).encode()
+    
+    _loads = json.loads
+
 # Configuration
 CONFIG_DIR = Path.home() / ".config" / "focus-tracker"
 CONFIG_FILE = CONFIG_DIR / "config.json"
@@ -46,96 +61,245 @@ DEFAULT_CONFIG = {
     "log_tasks": True
 }
 
+# Last loaded configuration and the config file mtime it was read at
+_config_cache = {"mtime": 0, "data": None}
+
 # Data directories
 DATA_DIR = Path.home() / ".local" / "share" / "focus-tracker"
 STATS_FILE = DATA_DIR / "statistics.csv"
+ABANDONED_INDEX = DATA_DIR / "abandoned_recent.json"  # Most recent abandoned tasks, newest first
+STATS_HEADER = (
+    "Date", 
+    "Tasks Completed", 
+    "Completed Time (min)", 
+    "Avg Completed Time (min)",
+    "Tasks Abandoned",
+    "Abandoned Time (min)",
+    "Avg Abandoned Time (min)",
+    "Completion Rate (%)"
+)
+DAY_HEADER = ("Task", "Start Time", "End Time", "Duration (minutes)", "Status")
+# Positions of the DAY_HEADER columns in a day log row
+COL_TASK, COL_START, COL_END, COL_DUR, COL_STATUS = range(len(DAY_HEADER))
+
+# Per-process caches of the current month directory and day log path,
+# keyed by date so they roll over at midnight
+_MONTH_CACHE = {}
+_DAY_CACHE = {}
+
+# Parsed day logs, keyed by path, with the (mtime, size) they were read at
+_DAY_ROWS_CACHE = {}
+
+# Long-lived append handle for today's log (see _get_day_writer)
+_day_log_fh = None
+_day_log_path = None
+_day_log_writer = None
 
 def setup():
     """Create config and data directories and files if they don't exist"""
-    if not CONFIG_DIR.exists():
-        CONFIG_DIR.mkdir(parents=True)
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     
-    if not CONFIG_FILE.exists():
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(DEFAULT_CONFIG, f, indent=2)
+    # Opening with 'x' (O_CREAT | O_EXCL) checks and creates in one call
+    try:
+        with open(CONFIG_FILE, 'xb') as f:
+            f.write(_dumps(DEFAULT_CONFIG))
+    except FileExistsError:
+        pass
     
-    if not DATA_DIR.exists():
-        DATA_DIR.mkdir(parents=True)
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
     
     # Create statistics file if it doesn't exist
-    if not STATS_FILE.exists():
-        with open(STATS_FILE, 'w', newline='') as f:
+    try:
+        with open(STATS_FILE, 'x', newline='') as f:
             writer = csv.writer(f)
-            writer.writerow([
-                "Date", 
-                "Tasks Completed", 
-                "Completed Time (min)", 
-                "Avg Completed Time (min)",
-                "Tasks Abandoned",
-                "Abandoned Time (min)",
-                "Avg Abandoned Time (min)",
-                "Completion Rate (%)"
-            ])
+            writer.writerow(STATS_HEADER)
+    except FileExistsError:
+        pass
+
+def _atomic_write(path, data, binary=False):
+    """Replace a file's contents so it is never left half-written
+    
+    data is either the contents to write or a callable that writes them to
+    the open file. The file is written to a sibling .tmp file first and then
+    renamed over the original.
+    """
+    tmp_file = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_file, 'wb' if binary else 'w', newline=None if binary else '') as f:
+        if callable(data):
+            data(f)
+        else:
+            f.write(data)
+    os.replace(tmp_file, path)
 
 def load_config():
-    """Load configuration from file"""
-    with open(CONFIG_FILE, 'r') as f:
-        return json.load(f)
+    """Load configuration from file, re-reading it only when it has changed"""
+    mtime = CONFIG_FILE.stat().st_mtime_ns
+    if mtime != _config_cache["mtime"]:
+        _config_cache["data"] = _loads(CONFIG_FILE.read_bytes())
+        _config_cache["mtime"] = mtime
+    return _config_cache["data"]
 
 def save_config(config):
     """Save configuration to file"""
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    _atomic_write(CONFIG_FILE, _dumps(config), binary=True)
 
-def get_month_dir():
-    """Get the directory for the current month's logs"""
-    today = datetime.datetime.now()
-    month_dir = DATA_DIR / f"{today.year}_{today.month:02d}"
-    if not month_dir.exists():
-        month_dir.mkdir(parents=True)
+def get_month_dir(now=None):
+    """Get the directory for the current month's logs (or the month of now)"""
+    today = now or datetime.datetime.now()
+    key = (today.year, today.month)
+    month_dir = _MONTH_CACHE.get(key)
+    if month_dir is None:
+        month_dir = DATA_DIR / f"{today.year}_{today.month:02d}"
+        month_dir.mkdir(parents=True, exist_ok=True)
+        # Only the current month is ever needed, so drop stale entries
+        _MONTH_CACHE.clear()
+        _MONTH_CACHE[key] = month_dir
     return month_dir
 
-def get_day_log_file():
-    """Get the CSV log file for the current day"""
-    today = datetime.datetime.now()
-    month_dir = get_month_dir()
-    return month_dir / f"tasks_{today.year}_{today.month:02d}_{today.day:02d}.csv"
+def get_day_log_file(now=None):
+    """Get the CSV log file for the current day (or the day of now)"""
+    today = now or datetime.datetime.now()
+    key = (today.year, today.month, today.day)
+    log_file = _DAY_CACHE.get(key)
+    if log_file is None:
+        month_dir = get_month_dir(today)
+        log_file = month_dir / f"tasks_{today.year}_{today.month:02d}_{today.day:02d}.csv"
+        _DAY_CACHE.clear()
+        _DAY_CACHE[key] = log_file
+    return log_file
 
 def initialize_day_log():
     """Initialize the daily log file if it doesn't exist"""
     log_file = get_day_log_file()
-    if not log_file.exists():
-        with open(log_file, 'w', newline='') as f:
+    try:
+        with open(log_file, 'x', newline='') as f:
             writer = csv.writer(f)
-            writer.writerow(["Task", "Start Time", "End Time", "Duration (minutes)", "Status"])
+            writer.writerow(DAY_HEADER)
+    except FileExistsError:
+        pass
 
-def update_task_status(task_name, new_status):
-    """Update the status of a task in today's log"""
+def _get_day_writer(now=None):
+    """Get a CSV writer appending to today's log, reopening it when the day changes"""
+    global _day_log_fh, _day_log_path, _day_log_writer
+    log_file = get_day_log_file(now)
+    if _day_log_fh is None or log_file != _day_log_path:
+        _close_day_writer()
+        _day_log_fh = open(log_file, 'a', buffering=65536, newline='')
+        _day_log_path = log_file
+        _day_log_writer = csv.writer(_day_log_fh)
+        if _day_log_fh.tell() == 0:
+            _day_log_writer.writerow(DAY_HEADER)
+    return _day_log_writer
+
+def _append_day_row(row, now=None):
+    """Append a row to today's log and flush it to disk"""
+    _get_day_writer(now).writerow(row)
+    # Flush per event so a crash never loses a logged task
+    _day_log_fh.flush()
+
+def _close_day_writer():
+    """Close the open day log, if any, e.g. before it is rewritten or moved"""
+    global _day_log_fh, _day_log_path, _day_log_writer
+    if _day_log_fh is not None:
+        _day_log_fh.close()
+    _day_log_fh = None
+    _day_log_path = None
+    _day_log_writer = None
+
+def _apply_status_changes(rows):
+    """Resolve a day log's rows into their current state
+    
+    Status changes are appended to the log as rows with only a task name
+    and status. Each one replaces the status of that task's earlier
+    Abandoned/In Progress rows, and is itself dropped from the result.
+    """
+    tasks = []
+    changeable = {}  # task name -> rows a later status change applies to
+    for row in rows:
+        if row[COL_START]:
+            tasks.append(row)
+            if row[COL_STATUS] in ["Abandoned", "In Progress"]:
+                changeable.setdefault(row[COL_TASK], []).append(row)
+        else:
+            changed = changeable.pop(row[COL_TASK], [])
+            for task in changed:
+                task[COL_STATUS] = row[COL_STATUS]
+            if changed and row[COL_STATUS] in ["Abandoned", "In Progress"]:
+                changeable[row[COL_TASK]] = changed
+    return tasks
+
+def _iter_day_rows(log_file):
+    """Yield the rows of a day log after its header, reading it through mmap"""
+    with open(log_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # mmap cannot map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Let csv split the lines so quoted task names containing commas survive
+            reader = csv.reader(line.decode() for line in iter(mm.readline, b''))
+            next(reader, None)  # Skip header
+            for row in reader:
+                if row:
+                    yield row
+
+def _read_day_log(log_file):
+    """Read all tasks from a day log with status changes applied
+    
+    The result is cached until the file's size or mtime changes, so callers
+    share it and must not modify the rows.
+    """
+    st = log_file.stat()
+    version = (st.st_mtime_ns, st.st_size)
+    cached = _DAY_ROWS_CACHE.get(log_file)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    rows = _apply_status_changes(_iter_day_rows(log_file))
+    _DAY_ROWS_CACHE[log_file] = (version, rows)
+    return rows
+
+def compact_day_log():
+    """Fold appended status changes in today's log back into its task rows"""
     log_file = get_day_log_file()
     if not log_file.exists():
-        return False
+        return
     
-    # Read all rows
-    rows = []
     with open(log_file, 'r', newline='') as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-        for row in reader:
-            if row["Task"] == task_name and row["Status"] in ["Abandoned", "In Progress"]:
-                row["Status"] = new_status
-            rows.append(row)
-    
-    # Write back all rows
-    with open(log_file, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+        reader = csv.reader(f)
+        next(reader, None)  # Skip header
+        rows = [row for row in reader if row]
+    
+    # Nothing to do unless a status change has been appended
+    if all(row[COL_START] for row in rows):
+        return
+    
+    def write_log(f):
+        writer = csv.writer(f)
+        writer.writerow(DAY_HEADER)
+        writer.writerows(_apply_status_changes(rows))
+    
+    _close_day_writer()
+    _atomic_write(log_file, write_log)
+
+def update_task_status(task_name, new_status, now=None):
+    """Update the status of a task in today's log"""
+    log_file = get_day_log_file(now)
+    if not log_file.exists():
+        return False
+    
+    # Append a status change rather than rewriting the file;
+    # readers apply it with _apply_status_changes()
+    _append_day_row([task_name, "", "", "", new_status], now)
+    
+    if new_status != "Abandoned":
+        _drop_abandoned_task(task_name)
     
     return True
 
 def log_task(task, start_time, end_time=None, status="In Progress"):
     """Log task to the daily CSV file"""
-    log_file = get_day_log_file()
+    # One clock read picks today's log for every helper below
+    now = datetime.datetime.now()
+    log_file = get_day_log_file(now)
     
     # Check if the file exists
     file_exists = log_file.exists()
@@ -145,19 +309,21 @@ def log_task(task, start_time, end_time=None, status="In Progress"):
     if status == "In Progress":
         # Check if this task exists as abandoned in today's log
         if file_exists:
-            with open(log_file, 'r', newline='') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-                
-                # Find abandoned entries for this task name
-                for row in rows:
-                    if row["Task"] == task and row["Status"] == "Abandoned":
+            # Stream the log for an abandoned entry with this task name. A later
+            # status change row (no start time) clears it, so this cannot stop
+            # at the first match, but nothing is kept in memory.
+            for row in _iter_day_rows(log_file):
+                if row[COL_TASK] != task:
+                    continue
+                if row[COL_START]:
+                    if row[COL_STATUS] == "Abandoned":
                         updating_abandoned = True
-                        break
+                elif row[COL_STATUS] != "Abandoned":
+                    updating_abandoned = False
             
             # If we found an abandoned entry for this task, update it rather than creating a new one
             if updating_abandoned:
-                update_task_status(task, "In Progress (Resumed)")
+                update_task_status(task, "In Progress (Resumed)", now)
                 return
     
     # Calculate duration if end_time is provided
@@ -165,157 +331,173 @@ def log_task(task, start_time, end_time=None, status="In Progress"):
     if end_time:
         duration = (end_time - start_time).total_seconds() / 60  # in minutes
     
-    # Convert times to strings
-    start_str = start_time.strftime("%H:%M:%S")
-    end_str = end_time.strftime("%H:%M:%S") if end_time else ""
-    
-    with open(log_file, 'a', newline='') as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(["Task", "Start Time", "End Time", "Duration (minutes)", "Status"])
-        
-        writer.writerow([
-            task,
-            start_str,
-            end_str,
-            f"{duration:.2f}" if duration else "",
-            status
-        ])
+    # Convert times to strings (f-strings skip strftime's format parsing)
+    start_str = f"{start_time.hour:02d}:{start_time.minute:02d}:{start_time.second:02d}"
+    end_str = f"{end_time.hour:02d}:{end_time.minute:02d}:{end_time.second:02d}" if end_time else ""
+    
+    row = [
+        task,
+        start_str,
+        end_str,
+        f"{duration:.2f}" if duration else "",
+        status
+    ]
+    _append_day_row(row, now)
+    
+    if status == "Abandoned":
+        _push_abandoned_task(dict(zip(DAY_HEADER, row)))
 
-def get_abandoned_tasks():
-    """Get a list of abandoned tasks from all logs"""
+def _scan_abandoned_tasks():
+    """Find the most recent abandoned tasks by reading this month's logs"""
     abandoned_tasks = []
+    seen = set()  # Task names already in the list
     
     # Check for tasks in the current month
     month_dir = get_month_dir()
     if not month_dir.exists():
         return abandoned_tasks
     
-    # Get all CSV files in the month directory
+    # Get all CSV files in the month directory; names sort by date
     csv_files = list(month_dir.glob("*.csv"))
+    csv_files.sort(reverse=True)
     
     # Get the most recent abandoned tasks
-    for csv_file in sorted(csv_files, reverse=True):
+    for csv_file in csv_files:
         if not csv_file.exists():
             continue
         
-        with open(csv_file, 'r', newline='') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row["Status"] == "Abandoned":
-                    # Add to list if not already in it (by task name)
-                    if not any(t['Task'] == row['Task'] for t in abandoned_tasks):
-                        abandoned_tasks.append(row)
-        
-        # Limit to the 10 most recent abandoned tasks
-        if len(abandoned_tasks) >= 10:
-            break
+        # Newest rows first, to match the order the index keeps
+        for row in reversed(_read_day_log(csv_file)):
+            if row[COL_STATUS] != "Abandoned":
+                continue
+            
+            # Add to list if not already in it (by task name)
+            name = row[COL_TASK]
+            if name in seen:
+                continue
+            seen.add(name)
+            abandoned_tasks.append(dict(zip(DAY_HEADER, row)))
+            
+            # Limit to the 10 most recent abandoned tasks
+            if len(abandoned_tasks) >= 10:
+                return abandoned_tasks
     
-    return abandoned_tasks[:10]  # Return at most 10 tasks
+    return abandoned_tasks
+
+def _save_abandoned_index(abandoned_tasks):
+    """Replace the index of recently abandoned tasks"""
+    _atomic_write(ABANDONED_INDEX, _dumps(abandoned_tasks), binary=True)
+
+def get_abandoned_tasks():
+    """Get a list of abandoned tasks from all logs, most recent first"""
+    if ABANDONED_INDEX.exists():
+        return _loads(ABANDONED_INDEX.read_bytes())
+    
+    # Cold start: build the index from the logs once
+    abandoned_tasks = _scan_abandoned_tasks()
+    _save_abandoned_index(abandoned_tasks)
+    return abandoned_tasks
+
+def _push_abandoned_task(row):
+    """Put a newly abandoned task at the front of the index"""
+    abandoned_tasks = [t for t in get_abandoned_tasks() if t['Task'] != row['Task']]
+    abandoned_tasks.insert(0, row)
+    _save_abandoned_index(abandoned_tasks[:10])
+
+def _drop_abandoned_task(task_name):
+    """Remove a task that is no longer abandoned from the index"""
+    if not ABANDONED_INDEX.exists():
+        return
+    abandoned_tasks = get_abandoned_tasks()
+    remaining = [t for t in abandoned_tasks if t['Task'] != task_name]
+    if len(remaining) != len(abandoned_tasks):
+        _save_abandoned_index(remaining)
 
 def update_statistics():
     """Update the statistics CSV with data from today and yesterday"""
     today = datetime.datetime.now().date()
     yesterday = today - datetime.timedelta(days=1)
     
-    # Process today and yesterday
+    # Read the existing statistics once, keyed by date
+    stats = {}
+    stats_mtime = 0
+    if STATS_FILE.exists():
+        with open(STATS_FILE, 'r', newline='') as f:
+            stats_mtime = os.fstat(f.fileno()).st_mtime_ns
+            reader = csv.reader(f)
+            next(reader, None)  # Skip header
+            stats = {row[0]: row for row in reader if row}
+    
+    dirty = False
+    
+    # Process today and yesterday, updating only the in-memory stats
     for day in [yesterday, today]:
         month_dir = DATA_DIR / f"{day.year}_{day.month:02d}"
         day_file = month_dir / f"tasks_{day.year}_{day.month:02d}_{day.day:02d}.csv"
+        day_str = day.strftime("%Y-%m-%d")
+        
+        try:
+            day_mtime = day_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            continue
         
-        if not day_file.exists():
+        # Skip a day whose log hasn't changed since its stats were written
+        # (strictly older, as mtimes within one clock tick compare equal)
+        if day_str in stats and day_mtime < stats_mtime:
             continue
         
         # Read the day's tasks
-        completed_tasks = []
-        abandoned_tasks = []
+        tasks_completed = 0
+        tasks_abandoned = 0
         total_completed_duration = 0
         total_abandoned_duration = 0
         
-        with open(day_file, 'r', newline='') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row["Status"] == "Completed" and row["Duration (minutes)"]:
-                    completed_tasks.append(row)
-                    try:
-                        total_completed_duration += float(row["Duration (minutes)"])
-                    except ValueError:
-                        pass
-                elif row["Status"] == "Abandoned" and row["Duration (minutes)"]:
-                    abandoned_tasks.append(row)
-                    try:
-                        total_abandoned_duration += float(row["Duration (minutes)"])
-                    except ValueError:
-                        pass
+        for row in _read_day_log(day_file):
+            if row[COL_STATUS] == "Completed" and row[COL_DUR]:
+                tasks_completed += 1
+                total_completed_duration += float(row[COL_DUR])
+            elif row[COL_STATUS] == "Abandoned" and row[COL_DUR]:
+                tasks_abandoned += 1
+                total_abandoned_duration += float(row[COL_DUR])
         
         # Skip if no tasks
-        if not completed_tasks and not abandoned_tasks:
+        if not tasks_completed and not tasks_abandoned:
             continue
         
         # Calculate statistics
-        day_str = day.strftime("%Y-%m-%d")
-        tasks_completed = len(completed_tasks)
-        tasks_abandoned = len(abandoned_tasks)
         avg_completed_duration = total_completed_duration / tasks_completed if tasks_completed > 0 else 0
         avg_abandoned_duration = total_abandoned_duration / tasks_abandoned if tasks_abandoned > 0 else 0
         completion_rate = tasks_completed / (tasks_completed + tasks_abandoned) * 100 if (tasks_completed + tasks_abandoned) > 0 else 0
         
-        # Check if this day already exists in statistics
-        existing_stats = []
-        if STATS_FILE.exists():
-            with open(STATS_FILE, 'r', newline='') as f:
-                reader = csv.reader(f)
-                headers = next(reader, None)  # Skip header
-                existing_stats = list(reader)
-        
-        # Update or add the statistics
-        day_updated = False
-        for i, row in enumerate(existing_stats):
-            if row[0] == day_str:
-                existing_stats[i] = [
-                    day_str, 
-                    tasks_completed, 
-                    f"{total_completed_duration:.2f}", 
-                    f"{avg_completed_duration:.2f}",
-                    tasks_abandoned,
-                    f"{total_abandoned_duration:.2f}",
-                    f"{avg_abandoned_duration:.2f}",
-                    f"{completion_rate:.1f}"
-                ]
-                day_updated = True
-                break
-        
-        if not day_updated:
-            existing_stats.append([
-                day_str, 
-                tasks_completed, 
-                f"{total_completed_duration:.2f}", 
-                f"{avg_completed_duration:.2f}",
-                tasks_abandoned,
-                f"{total_abandoned_duration:.2f}",
-                f"{avg_abandoned_duration:.2f}",
-                f"{completion_rate:.1f}"
-            ])
-        
-        # Write back to statistics file
-        with open(STATS_FILE, 'w', newline='') as f:
+        # Update or add the statistics for this day
+        day_stats = [
+            day_str, 
+            str(tasks_completed), 
+            f"{total_completed_duration:.2f}", 
+            f"{avg_completed_duration:.2f}",
+            str(tasks_abandoned),
+            f"{total_abandoned_duration:.2f}",
+            f"{avg_abandoned_duration:.2f}",
+            f"{completion_rate:.1f}"
+        ]
+        if stats.get(day_str) != day_stats:
+            stats[day_str] = day_stats
+            dirty = True
+    
+    # Write back to statistics file once, only if something changed
+    if dirty:
+        def write_stats(f):
             writer = csv.writer(f)
-            writer.writerow([
-                "Date", 
-                "Tasks Completed", 
-                "Completed Time (min)", 
-                "Avg Completed Time (min)",
-                "Tasks Abandoned",
-                "Abandoned Time (min)",
-                "Avg Abandoned Time (min)",
-                "Completion Rate (%)"
-            ])
-            writer.writerows(existing_stats)
-
-def send_notification(title, message):
-    """Send a desktop notification"""
+            writer.writerow(STATS_HEADER)
+            writer.writerows(stats.values())
+        
+        _atomic_write(STATS_FILE, write_stats)
+
+def send_notification(title, message, timeout):
+    """Send a desktop notification that expires after timeout milliseconds"""
+    # Imported here so commands that exit early (--summary etc.) skip it
+    import subprocess
     try:
-        timeout = load_config()["notification_timeout"]
         subprocess.run([
             "notify-send",
             title,
@@ -330,6 +512,7 @@ def send_notification(title, message):
 
 def check_dependencies():
     """Check if required dependencies are installed"""
+    import subprocess
     try:
         subprocess.run(["notify-send", "--version"], 
                       stdout=subprocess.PIPE, 
@@ -341,36 +524,49 @@ def check_dependencies():
         print("  sudo apt install libnotify-bin")
         return False
 
-def get_input_with_timeout(timeout=0.05):
-    """Non-blocking input check with support for single keypress detection"""
-    try:
-        # Set terminal to raw mode to read single characters
-        import termios
-        import tty
-        from select import select
-        
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
+class RawStdin:
+    """Keep the terminal in single-keypress mode for the duration of a with block"""
+    
+    def __init__(self):
+        self.fd = sys.stdin.fileno()
+        self.old_settings = None
+    
+    def __enter__(self):
         try:
-            tty.setraw(fd)
-            # Use select to check if there's input available
-            rlist, _, _ = select([sys.stdin], [], [], timeout)
-            if rlist:
-                # Read a single character
-                char = sys.stdin.read(1)
-                # Convert to lowercase for case-insensitive commands
-                return char.lower()
-            return None
+            self.old_settings = termios.tcgetattr(self.fd)
+        except termios.error:
+            # Not a terminal, so input stays line-based
+            self.old_settings = None
+        else:
+            # cbreak rather than raw mode, so output and Ctrl+C behave normally
+            tty.setcbreak(self.fd)
+        return self
+    
+    def __exit__(self, *exc_info):
+        # Restore terminal settings no matter what
+        if self.old_settings is not None:
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.old_settings)
+    
+    @contextlib.contextmanager
+    def cooked(self):
+        """Temporarily restore normal line input, e.g. around input() prompts"""
+        self.__exit__()
+        try:
+            yield
         finally:
-            # Restore terminal settings no matter what
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-    except (Exception, termios.error) as e:
-        # Fall back to the old method if we can't set raw mode
-        # (for systems that don't support termios)
-        ready, _, _ = select.select([sys.stdin], [], [], timeout)
-        if ready:
-            return sys.stdin.readline().strip().lower()
+            if self.old_settings is not None:
+                tty.setcbreak(self.fd)
+
+def get_input_with_timeout(timeout=None):
+    """Wait up to timeout seconds (forever if None) for a single keypress"""
+    rlist, _, _ = select.select([sys.stdin], [], [], timeout)
+    if not rlist:
         return None
+    if sys.stdin.isatty():
+        # Read a single character, lowercased for case-insensitive commands
+        return sys.stdin.read(1).lower()
+    # Not a terminal (see RawStdin), so commands arrive a line at a time
+    return sys.stdin.readline().strip().lower()
 
 def get_today_summary(include_in_progress=True):
     """Get a summary of today's tasks, both completed and in-progress"""
@@ -378,69 +574,57 @@ def get_today_summary(include_in_progress=True):
     if not log_file.exists():
         return "No tasks recorded today."
     
-    completed_tasks = []
-    abandoned_tasks = []
-    in_progress_tasks = []
+    # Format each task's line as it is read, rather than collecting rows first
+    completed_lines = []
+    abandoned_lines = []
+    in_progress_lines = []
     total_completed_time = 0
     total_abandoned_time = 0
     
-    with open(log_file, 'r', newline='') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row["Status"] == "Completed" and row["Duration (minutes)"]:
-                completed_tasks.append(row)
-                try:
-                    total_completed_time += float(row["Duration (minutes)"])
-                except ValueError:
-                    pass
-            elif row["Status"] == "Abandoned" and row["Duration (minutes)"]:
-                abandoned_tasks.append(row)
-                try:
-                    total_abandoned_time += float(row["Duration (minutes)"])
-                except ValueError:
-                    pass
-            elif include_in_progress and row["Status"] == "In Progress":
-                in_progress_tasks.append(row)
-    
-    if not completed_tasks and not abandoned_tasks and not in_progress_tasks:
+    for row in _read_day_log(log_file):
+        if row[COL_STATUS] == "Completed" and row[COL_DUR]:
+            duration = float(row[COL_DUR])
+            total_completed_time += duration
+            completed_lines.append(f"{len(completed_lines) + 1}. {row[COL_TASK]} - {duration:.1f} minutes\n")
+        elif row[COL_STATUS] == "Abandoned" and row[COL_DUR]:
+            duration = float(row[COL_DUR])
+            total_abandoned_time += duration
+            abandoned_lines.append(f"{len(abandoned_lines) + 1}. {row[COL_TASK]} - {duration:.1f} minutes\n")
+        elif include_in_progress and row[COL_STATUS] == "In Progress":
+            in_progress_lines.append(f"{len(in_progress_lines) + 1}. {row[COL_TASK]} - started at {row[COL_START]}\n")
+    
+    num_completed = len(completed_lines)
+    num_abandoned = len(abandoned_lines)
+    if not num_completed and not num_abandoned and not in_progress_lines:
         return "No tasks recorded today."
     
-    summary = "\n=== Today's Tasks ===\n"
+    summary = ["\n=== Today's Tasks ===\n"]
     
     # Add completed tasks
-    if completed_tasks:
-        summary += "COMPLETED:\n"
-        for i, task in enumerate(completed_tasks, 1):
-            duration = float(task["Duration (minutes)"])
-            summary += f"{i}. {task['Task']} - {duration:.1f} minutes\n"
-        
-        summary += f"\nCompleted: {len(completed_tasks)} tasks, {total_completed_time:.1f} minutes"
+    if completed_lines:
+        summary.append("COMPLETED:\n")
+        summary.extend(completed_lines)
+        summary.append(f"\nCompleted: {num_completed} tasks, {total_completed_time:.1f} minutes")
     else:
-        summary += "No completed tasks yet.\n"
+        summary.append("No completed tasks yet.\n")
     
     # Add abandoned tasks
-    if abandoned_tasks:
-        summary += "\n\nABANDONED:\n"
-        for i, task in enumerate(abandoned_tasks, 1):
-            duration = float(task["Duration (minutes)"])
-            summary += f"{i}. {task['Task']} - {duration:.1f} minutes\n"
-        
-        summary += f"\nAbandoned: {len(abandoned_tasks)} tasks, {total_abandoned_time:.1f} minutes"
+    if abandoned_lines:
+        summary.append("\n\nABANDONED:\n")
+        summary.extend(abandoned_lines)
+        summary.append(f"\nAbandoned: {num_abandoned} tasks, {total_abandoned_time:.1f} minutes")
     
     # Add in-progress tasks if requested
-    if include_in_progress and in_progress_tasks:
-        summary += "\n\nSTARTED BUT NOT COMPLETED:\n"
-        for i, task in enumerate(in_progress_tasks, 1):
-            start_time = task["Start Time"]
-            summary += f"{i}. {task['Task']} - started at {start_time}\n"
+    if in_progress_lines:
+        summary.append("\n\nSTARTED BUT NOT COMPLETED:\n")
+        summary.extend(in_progress_lines)
     
     # Add completion rate if there are any completed or abandoned tasks
-    if completed_tasks or abandoned_tasks:
-        total_tasks = len(completed_tasks) + len(abandoned_tasks)
-        completion_rate = len(completed_tasks) / total_tasks * 100 if total_tasks > 0 else 0
-        summary += f"\n\nCompletion rate: {completion_rate:.1f}%"
+    if num_completed or num_abandoned:
+        completion_rate = num_completed / (num_completed + num_abandoned) * 100
+        summary.append(f"\n\nCompletion rate: {completion_rate:.1f}%")
     
-    return summary
+    return "".join(summary)
 
 def print_help():
     """Print all available commands"""
@@ -499,6 +683,8 @@ def get_next_task():
 
 def handle_command(cmd, current_task, task_start_time, paused_time, is_paused):
     """Handle user commands during execution"""
+    config = load_config()
+    
     if cmd == "p":  # Pause/resume
         if is_paused:
             # Resume
@@ -525,7 +711,8 @@ def handle_command(cmd, current_task, task_start_time, paused_time, is_paused):
         task_start_time = datetime.datetime.now()
         log_task(current_task, task_start_time)
         print(f"\nNew task started: '{current_task}'")
-        send_notification("New Task Started", f"You're now working on: {current_task}")
+        send_notification("New Task Started", f"You're now working on: {current_task}",
+                          config["notification_timeout"])
     
     elif cmd == "x" and not is_paused:  # Abandon task
         end_time = datetime.datetime.now()
@@ -540,7 +727,8 @@ def handle_command(cmd, current_task, task_start_time, paused_time, is_paused):
         task_start_time = datetime.datetime.now()
         log_task(current_task, task_start_time)
         print(f"\nNew task started: '{current_task}'")
-        send_notification("New Task Started", f"You're now working on: {current_task}")
+        send_notification("New Task Started", f"You're now working on: {current_task}",
+                          config["notification_timeout"])
     
     elif cmd == "a":  # Show abandoned tasks and possibly resume one
         abandoned_tasks = get_abandoned_tasks()
@@ -564,12 +752,12 @@ def handle_command(cmd, current_task, task_start_time, paused_time, is_paused):
                     task_start_time = datetime.datetime.now()
                     print(f"\nResuming task: '{current_task}'")
                     log_task(current_task, task_start_time)
-                    send_notification("Task Resumed", f"You're now working on: {current_task}")
+                    send_notification("Task Resumed", f"You're now working on: {current_task}",
+                                      config["notification_timeout"])
             except ValueError:
                 print("Invalid selection.")
     
     elif cmd == "t":  # Change reminder interval
-        config = load_config()
         current = config["reminder_interval"]
         try:
             new_interval = int(input(f"\nCurrent reminder interval is {current} minutes. Enter new interval: "))
@@ -590,8 +778,7 @@ def create_startup_script():
     
     # Create autostart directory if it doesn't exist
     autostart_dir = desktop_file.parent
-    if not autostart_dir.exists():
-        autostart_dir.mkdir(parents=True)
+    autostart_dir.mkdir(parents=True, exist_ok=True)
     
     # Get path to current script
     script_path = os.path.abspath(sys.argv[0])
@@ -619,8 +806,6 @@ def main():
     parser.add_argument("--summary", action="store_true", help="Show today's task summary")
     parser.add_argument("--config", action="store_true", help="Edit configuration")
     parser.add_argument("--install", action="store_true", help="Install startup script")
-    parser.add_argument("--idle", type=float, default=0.05, 
-                        help="Idle time in seconds between checks (default: 0.05, higher values save CPU)")
     parser.add_argument("--show-data-dir", action="store_true", help="Show where data is stored")
     args = parser.parse_args()
     
@@ -657,6 +842,9 @@ def main():
     if not check_dependencies():
         sys.exit(1)
     
+    # Fold any status changes from earlier sessions into today's log
+    compact_day_log()
+    
     # Update statistics on startup
     update_statistics()
     
@@ -679,73 +867,90 @@ def main():
     print(f"You'll receive a reminder every {config['reminder_interval']} minutes")
     
     # Send initial notification
-    send_notification("Task Started", f"You're now working on: {current_task}")
+    send_notification("Task Started", f"You're now working on: {current_task}",
+                      config["notification_timeout"])
     
     # Setup variables for tracking state
     last_reminder_time = datetime.datetime.now()
+    now = last_reminder_time
     is_paused = False
     paused_time = None
     
     try:
-        while True:
-            # Check for user input
-            cmd = get_input_with_timeout(args.idle)
-            
-            # Process command
-            try:
-                if cmd:
-                    # Use lowercase for case-insensitive commands
-                    cmd = cmd.lower()
-                    
-                    if cmd == 'l':  # List tasks
-                        print("\n" + get_today_summary())
-                        print(f"\nCurrent task: '{current_task}'" + (" (paused)" if is_paused else ""))
-                    
-                    elif cmd == 'h':  # Help
-                        print_help()
+        # Read single keypresses for the whole session, not per check
+        with RawStdin() as stdin:
+            while True:
+                # Sleep until a key is pressed or the next reminder is due
+                # (reminders are skipped while paused, so then just wait for a key)
+                timeout = None
+                if not is_paused:
+                    config = load_config()
+                    deadline = last_reminder_time + datetime.timedelta(minutes=config["reminder_interval"])
+                    timeout = max(0, (deadline - now).total_seconds())
+                
+                # Check for user input
+                cmd = get_input_with_timeout(timeout)
+                
+                # Process command
+                try:
+                    if cmd:
+                        # Use lowercase for case-insensitive commands
+                        cmd = cmd.lower()
                         
-                    elif cmd in ['p', 'c', 't', 'x', 'a']:
-                        current_task, task_start_time, paused_time, is_paused = handle_command(
-                            cmd, current_task, task_start_time, paused_time, is_paused
-                        )
-                        last_reminder_time = datetime.datetime.now()  # Reset reminder timer after command
-                    
-                    elif cmd == 'q':  # Quit
-                        raise KeyboardInterrupt
-                    
-                    elif cmd == '\x03':  # Ctrl+C (ASCII ETX)
-                        raise KeyboardInterrupt
-                    
-                    elif cmd == ' ':  # Space bar - do nothing
-                        pass
-                    
-                    elif cmd in ['\n', '\r']:  # Enter key - do nothing
-                        pass
-                    
-                    elif cmd.isprintable():  # Show a message for unrecognized commands
-                        print(f"\nUnrecognized command: '{cmd}'. Press 'h' for help.")
-            except Exception as e:
-                print(f"\nError processing command: {e}")
-            
-            # Skip reminders if paused
-            if is_paused:
-                continue
-            
-            # Check if it's time for a reminder
-            current_time = datetime.datetime.now()
-            config = load_config()  # Reload config to get updated reminder interval
-            elapsed_seconds = (current_time - last_reminder_time).total_seconds()
-            
-            if elapsed_seconds >= config["reminder_interval"] * 60:
-                # Send reminder
-                send_notification(
-                    "Focus Check", 
-                    f"'{current_task}', are you on track?"
-                )
-                time_str = current_time.strftime("%H:%M")
-                print(f"[{time_str}] Reminder: '{current_task}', are you on track?")
-                last_reminder_time = current_time
-            
+                        if cmd == 'l':  # List tasks
+                            print("\n" + get_today_summary())
+                            print(f"\nCurrent task: '{current_task}'" + (" (paused)" if is_paused else ""))
+                        
+                        elif cmd == 'h':  # Help
+                            print_help()
+                            
+                        elif cmd in ['p', 'c', 't', 'x', 'a']:
+                            # These commands may prompt for input
+                            with stdin.cooked():
+                                current_task, task_start_time, paused_time, is_paused = handle_command(
+                                    cmd, current_task, task_start_time, paused_time, is_paused
+                                )
+                            last_reminder_time = datetime.datetime.now()  # Reset reminder timer after command
+                        
+                        elif cmd == 'q':  # Quit
+                            raise KeyboardInterrupt
+                        
+                        elif cmd == '\x03':  # Ctrl+C (ASCII ETX)
+                            raise KeyboardInterrupt
+                        
+                        elif cmd == ' ':  # Space bar - do nothing
+                            pass
+                        
+                        elif cmd in ['\n', '\r']:  # Enter key - do nothing
+                            pass
+                        
+                        elif cmd.isprintable():  # Show a message for unrecognized commands
+                            print(f"\nUnrecognized command: '{cmd}'. Press 'h' for help.")
+                except Exception as e:
+                    print(f"\nError processing command: {e}")
+                
+                # Read the clock once per wake; it also times the next wait
+                now = datetime.datetime.now()
+                
+                # Skip reminders if paused
+                if is_paused:
+                    continue
+                
+                # Check if it's time for a reminder
+                config = load_config()  # Picks up an updated reminder interval if the file changed
+                elapsed_seconds = (now - last_reminder_time).total_seconds()
+                
+                if elapsed_seconds >= config["reminder_interval"] * 60:
+                    # Send reminder
+                    send_notification(
+                        "Focus Check", 
+                        f"'{current_task}', are you on track?",
+                        config["notification_timeout"]
+                    )
+                    time_str = f"{now.hour:02d}:{now.minute:02d}"
+                    print(f"[{time_str}] Reminder: '{current_task}', are you on track?")
+                    last_reminder_time = now
+                
     except KeyboardInterrupt:
         # Complete the current task if not paused
         if current_task and not is_paused:
@@ -754,6 +959,8 @@ def main():
             log_task(current_task, task_start_time, end_time, "Completed")
             print(f"\nTask '{current_task}' ended. Duration: {duration:.1f} minutes")
         
+        _close_day_writer()
+        
         # Update statistics
         update_statistics()
         